@@ -92,7 +92,7 @@ class ExternalServiceStack(Stack):
 
         request_queue.grant_send_messages(inference_lambda)
         request_queue.grant_consume_messages(queue_processor_lambda)
-        request_event_source = SqsEventSource(request_queue, batch_size=1)
+        request_event_source = SqsEventSource(request_queue, batch_size=10)
         queue_processor_lambda.add_event_source(request_event_source)
 
         api_gateway = self._create_api_gw(
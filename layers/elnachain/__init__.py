@@ -1,5 +1,14 @@
 from .chat_models.openai_model import ChatOpenAI, SERPAPI
 from .embeddings.openai_model import OpenAIEmbeddings
 from .vectordb.elna_vectordb import ElnaVectorDB
-from .vectordb.opensearch import OpenSearchDB
 from .prompts.chat_prompt import PromptTemplate
+
+
+def __getattr__(name):
+    # opensearch-py is slow to import and no handler currently uses OpenSearch,
+    # so only load it when OpenSearchDB is actually requested
+    if name == "OpenSearchDB":
+        from .vectordb.opensearch import OpenSearchDB
+
+        return OpenSearchDB
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
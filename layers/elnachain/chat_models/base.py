@@ -30,13 +30,15 @@ class BaseModel:
             self._text_response = self.parse_response(response)
         except Exception as e:
             self._error_response = e
+            if self._logger:
+                self._logger.exception("chat completion failed")
             return None
         return self._text_response
 
     def parse_response(self, response):
         """Parse the response"""
         if self._logger:
-            self._logger.info(msg=f"ai raw response:{str(response)})")
+            self._logger.info("ai raw response:%s", response)
         result = response.choices[0].message.content.strip()
         return result
 
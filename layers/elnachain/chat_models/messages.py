@@ -19,6 +19,11 @@ class AiMessage:
         self.content = content
 
 
+# message class <-> openai role lookups used by format_message and serialize
+_MESSAGE_ROLES = {SystemMessage: "system", HumanMessage: "user", AiMessage: "assistant"}
+_ROLE_MESSAGES = {role: message_cls for message_cls, role in _MESSAGE_ROLES.items()}
+
+
 def format_message(messages):
     """format message to openai api call
 
@@ -31,12 +36,9 @@ def format_message(messages):
     converted_messages = []
 
     for message in messages:
-        if isinstance(message, SystemMessage):
-            converted_messages.append({"role": "system", "content": message.content})
-        elif isinstance(message, HumanMessage):
-            converted_messages.append({"role": "user", "content": message.content})
-        elif isinstance(message, AiMessage):
-            converted_messages.append({"role": "assistant", "content": message.content})
+        role = _MESSAGE_ROLES.get(type(message))
+        if role is not None:
+            converted_messages.append({"role": role, "content": message.content})
 
     return converted_messages
 
@@ -52,13 +54,8 @@ def serialize(messages):
     """
     converted_messages = []
     for message in messages:
-        if message["role"] == "assistant":
-            converted_messages.append(AiMessage(message["content"]))
-        elif message["role"] == "user":
-            converted_messages.append(HumanMessage(message["content"]))
-        elif message["role"] == "system":
-            converted_messages.append(SystemMessage(message["content"]))
-        else:
-            pass
+        message_cls = _ROLE_MESSAGES.get(message["role"])
+        if message_cls is not None:
+            converted_messages.append(message_cls(message["content"]))
 
     return converted_messages
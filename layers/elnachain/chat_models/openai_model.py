@@ -2,9 +2,9 @@
 """
 
 from elnachain.chat_models.base import BaseModel
-from openai import OpenAI
 from elnachain.chat_models.messages import format_message
 from elnachain.chat_models.tools import search_web
+from elnachain.client import get_openai_client
 import json
 
 
@@ -18,7 +18,7 @@ class ChatOpenAI(BaseModel):
     model_name = "gpt-4o"
 
     def __init__(self, api_key, logger=None) -> None:
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         super().__init__(client, logger)
 
 
@@ -32,7 +32,7 @@ class SERPAPI(BaseModel):
     model_name = "gpt-4o"
 
     def __init__(self, api_key, logger=None) -> None:
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         super().__init__(client, logger)
 
     def __call__(self, messages, url=None):
@@ -95,9 +95,7 @@ class SERPAPI(BaseModel):
 
                 # Check if a tool call is triggered
                 formatted_messages.append(response.choices[0].message)
-                self._logger.info(
-                    msg=f"***** Formatted Message:{str(formatted_messages)})"
-                )
+                self._logger.info("***** Formatted Message:%s", formatted_messages)
                 if response.choices[0].message.tool_calls:
                     print("Entering tool call")
                     tool_call = response.choices[0].message.tool_calls[0]
@@ -127,5 +125,6 @@ class SERPAPI(BaseModel):
 
         except Exception as e:
             self._error_response = str(e)
-            print(f"An error occurred: {e}")
+            if self._logger:
+                self._logger.exception("chat completion failed")
             return None
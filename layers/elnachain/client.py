@@ -0,0 +1,21 @@
+"""OpenAI client shared by the chat and embedding models."""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def get_openai_client(api_key: str):
+    """Get the OpenAI client for an api key, created once per process
+
+    Models using the same key share the client and its connection pool.
+    openai is imported on first use so handlers that never call a model
+    don't pay for the import at cold start.
+
+    Args:
+        api_key (str): OpenAI api key
+
+    Returns:
+        OpenAI: openai client
+    """
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
@@ -1,6 +1,8 @@
+from array import array
+from functools import lru_cache
 from typing import List
 
-from openai import OpenAI
+from elnachain.client import get_openai_client
 
 
 class OpenAIEmbeddings:
@@ -9,6 +11,10 @@ class OpenAIEmbeddings:
 
     """
 
+    # texts per embeddings request, keeps a batch of page sized chunks well
+    # under the per request input and token limits
+    batch_size = 256
+
     def __init__(
         self,
         api_key,
@@ -17,7 +23,7 @@ class OpenAIEmbeddings:
     ) -> None:
         self._model = model
         self._logger = logger
-        self._client = OpenAI(api_key=api_key)
+        self._client = get_openai_client(api_key)
 
     def embed_query(self, text: str) -> List[float]:
         """Call out to OpenAI's embedding endpoint for embedding query text.
@@ -26,13 +32,49 @@ class OpenAIEmbeddings:
             text: The text to embed.
 
         Returns:
-            Embedding for the text.
+            Embedding for the text. Repeated texts are served from an
+            in-process cache instead of calling the API again.
+        """
+        return list(self._embed(text.replace("\n", " ")))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Call out to OpenAI's embedding endpoint for a list of texts.
+
+        Texts are sent in batches of batch_size per request instead of one
+        request per text.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            Embeddings for the texts, in the same order.
+
+        Raises:
+            TypeError: if texts is not a list of strings
         """
-        text = text.replace("\n", " ")
-        return (
+        if not isinstance(texts, list) or not all(
+            isinstance(text, str) for text in texts
+        ):
+            raise TypeError("texts must be a list of strings")
+        texts = [text.replace("\n", " ") for text in texts]
+        embeddings = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self._client.embeddings.create(
+                input=texts[start : start + self.batch_size], model=self._model
+            )
+            embeddings.extend(item.embedding for item in response.data)
+        return embeddings
+
+    # each vector is kept as a float64 array, exact and about 12 KB for 1536
+    # dimensions, so a full cache holds about 25 MB of vectors plus the texts
+    @lru_cache(maxsize=2048)
+    def _embed(self, text: str) -> array:
+        """Embed text, memoized per client and text for warm invocations"""
+        return array(
+            "d",
             self._client.embeddings.create(input=[text], model=self._model)
             .data[0]
-            .embedding
+            .embedding,
         )
 
 
@@ -36,14 +36,21 @@ class ElnaVectorDB(Database):
         result = self._client.update_raw(
             self.CANISTER_ID, "create_collection", encode(params=params)
         )
-        self._logger.info(msg=f"creating index: {self._index_name}\n result: {result}")
+        self._logger.info(
+            "creating index: %s\n result: %s", self._index_name, result
+        )
 
     def delete_index(self):
         pass
 
     def insert(self, embedding, documents, file_name=None):
-        embeddings = [embedding.embed_query(doc["pageContent"]) for doc in documents]
         contents = [doc["pageContent"] for doc in documents]
+        # embed each distinct chunk once, repeated page contents share the vector
+        unique_contents = list(dict.fromkeys(contents))
+        unique_embeddings = dict(
+            zip(unique_contents, embedding.embed_documents(unique_contents))
+        )
+        embeddings = [unique_embeddings[text] for text in contents]
 
         params = [
             {"type": Types.Text, "value": self._index_name},
@@ -54,14 +61,16 @@ class ElnaVectorDB(Database):
         result = self._client.update_raw(
             self.CANISTER_ID, "insert", encode(params=params)
         )
-        self._logger.info(msg=f"inserting filename: {file_name}\n result: {result}")
+        self._logger.info("inserting filename: %s\n result: %s", file_name, result)
 
     def build_index(self):
         params = [{"type": Types.Text, "value": self._index_name}]
         result = self._client.update_raw(
             self.CANISTER_ID, "build_index", encode(params=params)
         )
-        self._logger.info(msg=f"building index: {self._index_name}\n result: {result}")
+        self._logger.info(
+            "building index: %s\n result: %s", self._index_name, result
+        )
 
     def create_insert(self, embedding, documents, file_name=None):
         """create a new index and insert documents to that index
@@ -104,7 +104,7 @@ class OpenSearchDB(Database):
         """
         for index, doc in enumerate(documents):
             info = doc["metadata"]["pdf"]["info"]
-            self._logger.info(msg=f"doc_info:{info}")
+            self._logger.info("doc_info:%s", info)
             my_doc = {
                 "_meta": {"filename": info.get("Title", file_name)},
                 "id": index,
@@ -152,7 +152,7 @@ class OpenSearchDB(Database):
 
         results = [text["_source"]["text"] for text in response["hits"]["hits"]]
         if self._logger:
-            self._logger.info(msg=f"search result: {results}")
+            self._logger.info("search result: %s", results)
         page_contents = [result["pageContent"] for result in results]
         return (False, "\n".join(page_contents))
 
@@ -1,4 +1,5 @@
 from .ai_models import GptTurboModel
 from .analytics import AnalyticsDataHandler
+from .aws_config import BOTO3_CONFIG
 from .request_data import RequestDataHandler
 from .request_queue import RequestQueueHandler
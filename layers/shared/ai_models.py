@@ -2,17 +2,54 @@
 
 Contains all the AI model related objects, parsing logic and implementations.
 """
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import orjson
+
+__all__ = ["BaseModel", "GptTurboModel", "get_response_cache_stats"]
+
+RESPONSE_CACHE_SIZE = 1024
+
+# completed responses keyed by request key, least recently used evicted first
+_response_cache: OrderedDict = OrderedDict()
+# requests answered without an upstream call, from the cache or a shared
+# in-flight call, and requests that called the model
+_response_cache_stats = {"hits": 0, "misses": 0}
+
+# upstream calls currently in flight, keyed by request key, so identical
+# concurrent requests wait for one call instead of each calling the model
+_inflight_requests: dict = {}
+_requests_lock = threading.Lock()
+
+
+def get_response_cache_stats() -> dict:
+    """Get the response cache hit and miss counts of this process"""
+    with _requests_lock:
+        return dict(_response_cache_stats)
 
 
 class BaseModel:
     """Base class for all AI models"""
 
+    __slots__ = (
+        "_logger",
+        "_client",
+        "_event",
+        "_messages",
+        "_text_response",
+        "_error_response",
+    )
+
     model_name: str = "base_model"
 
     def __init__(self, client, logger=None):
         self._logger = logger
         self._client = client
         self._event = None
+        self._messages = None
         self._text_response = ""
         self._error_response = ""
 
@@ -20,30 +57,72 @@ class BaseModel:
         return f"{self.model_name} - Model"
 
     def get_request_messages(self) -> list:
-        """Get the request msg"""
-        messages = [
-            {"role": "system", "content": self.get_biography()},
-            {"role": "user", "content": self.get_input_prompt()},
-        ]
-        return messages
+        """Get the request msg, built once per event"""
+        if self._messages is None:
+            self._messages = [
+                {"role": "system", "content": self.get_biography()},
+                {"role": "user", "content": self.get_input_prompt()},
+            ]
+        return self._messages
 
     def create_response(self, event) -> bool:
         """Create the response message"""
         self._event = event
+        self._messages = None
         try:
-            response = self._client.chat.completions.create(
-                model=self.model_name, messages=self.get_request_messages()
-            )
-            self._text_response = self.parse_response(response)
+            self.validate_event(event)
+            self._text_response = self._complete(self.get_request_messages())
         except Exception as e:
             self._error_response = e
             return False
         return True
 
+    def get_request_key(self, messages) -> str:
+        """Get a key identifying the model request for the given messages"""
+        payload = orjson.dumps([self.model_name, messages], option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    def _complete(self, messages) -> str:
+        """Call the model, answering repeated requests from the response cache
+        and sharing the call with identical in-flight requests"""
+        key = self.get_request_key(messages)
+        with _requests_lock:
+            cached = _response_cache.get(key)
+            if cached is not None:
+                _response_cache.move_to_end(key)
+                _response_cache_stats["hits"] += 1
+                return cached
+            future = _inflight_requests.get(key)
+            leader = future is None
+            if leader:
+                future = _inflight_requests[key] = Future()
+            _response_cache_stats["misses" if leader else "hits"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            response = self._client.chat.completions.create(
+                model=self.model_name, messages=messages
+            )
+            result = self.parse_response(response)
+        except Exception as e:
+            with _requests_lock:
+                del _inflight_requests[key]
+            future.set_exception(e)
+            raise
+
+        with _requests_lock:
+            del _inflight_requests[key]
+            _response_cache[key] = result
+            if len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+        future.set_result(result)
+        return result
+
     def parse_response(self, response):
         """Parse the response"""
 
-        self._logger.info(msg=f"ai raw response:{str(response)})")
+        self._logger.info("ai raw response:%s", response)
         result = response.choices[0].message.content.strip()
         return result
 
@@ -55,25 +134,25 @@ class BaseModel:
         """Get the error response"""
         return self._error_response
 
+    @staticmethod
+    def validate_event(event):
+        """Check the event carries the fields the request messages are built from"""
+        missing = [key for key in ("biography", "input_prompt") if key not in event]
+        if missing:
+            raise KeyError(f"missing event fields {missing}")
+
     def get_biography(self) -> str:
         """Get the biography"""
-        try:
-            bio = self._event["biography"]
-        except Exception as e:
-            raise Exception(f"unable to parse biography {str(e)}")
-
-        return bio
+        return self._event["biography"]
 
     def get_input_prompt(self) -> str:
         """Get the input prompt"""
-        try:
-            prompt = self._event["input_prompt"]
-        except Exception as e:
-            raise Exception(f"unable to parse input_prompt {str(e)}")
-        return prompt
+        return self._event["input_prompt"]
 
 
 class GptTurboModel(BaseModel):
     """GptTurboModel class"""
 
+    __slots__ = ()
+
     model_name = "gpt-3.5-turbo"
@@ -15,26 +15,22 @@ class AnalyticsDataHandler:
     def put_data(self,bot_id):
         """put data into dynamoDB
 
+        Increments the message counter in a single UpdateItem call, ADD
+        creates the item with count 1 when it does not exist yet.
+
         Args:
             bot_id (str): bot id
         """
 
-        response = self.table.get_item(Key={self.id_attribute: bot_id})
-
-        if 'Item' in response:
-            # Item exists, increment the counter
-            existing_item = response['Item']
-            new_count = existing_item[self.counter_attribute] + 1
-
-            # Update the item with the new count
-            self.table.update_item(
-                Key={self.id_attribute: bot_id},
-                UpdateExpression=f"SET {self.counter_attribute} = :new_count",
-                ExpressionAttributeValues={":new_count": new_count}
-            )
-
-            self._logger.info(msg=f"Item with ID {bot_id} exists. Count incremented to {new_count}")
-        else:
-            # Item does not exist, create a new row
-            self.table.put_item(Item={self.id_attribute: bot_id, self.counter_attribute: 1})
-            self._logger.info(msg=f"New item with ID {bot_id} created with count 1")
+        response = self.table.update_item(
+            Key={self.id_attribute: bot_id},
+            UpdateExpression="ADD #count :one",
+            ExpressionAttributeNames={"#count": self.counter_attribute},
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        new_count = response["Attributes"][self.counter_attribute]
+
+        self._logger.info(
+            "Item with ID %s count incremented to %s", bot_id, new_count
+        )
@@ -0,0 +1,9 @@
+"""AWS client configuration shared by the lambda handlers."""
+from botocore.config import Config
+
+# keep idle pooled connections alive between warm invocations and let botocore
+# back off adaptively on throttling instead of retrying in lockstep
+BOTO3_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 3},
+)
@@ -1,13 +1,14 @@
 """Handle the request data for the service."""
-from boto3.dynamodb.conditions import Key
+import random
 import time
 
 
 class RequestDataHandler:
     """Handle the request data for the service."""
 
-    retry_count = 60
-    retry_interval_sec = 1
+    response_timeout_sec = 60
+    initial_poll_interval_sec = 0.05
+    max_poll_interval_sec = 1
 
     def __init__(self, table_name, client, logger):
         self._table_name = table_name
@@ -16,34 +17,71 @@ class RequestDataHandler:
 
     def store_prompt_response(
         self, identifier: str, ai_response: str
-    ):
-        """Store prompt response to the dynamodb table"""
-        self.table.put_item(Item={"pk": identifier, "response": ai_response})
+    ) -> bool:
+        """Store prompt response to the dynamodb table
+
+        The write is conditional on no response being stored for the
+        identifier yet, so a redelivered message can not overwrite an earlier
+        response. A null response, left by a failed call, may be overwritten.
+
+        Returns:
+            bool: False if a response was already stored for the identifier
+        """
+        try:
+            self.table.put_item(
+                Item={"pk": identifier, "response": ai_response},
+                ConditionExpression=(
+                    "attribute_not_exists(pk) OR attribute_type(#response, :null)"
+                ),
+                ExpressionAttributeNames={"#response": "response"},
+                ExpressionAttributeValues={":null": "NULL"},
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            self._logger.info("Response already stored for %s", identifier)
+            return False
+        return True
 
     def query_prompt_response(self, identifier: str):
-        """Query prompt response from the dynamodb table using identifier"""
-        response = self.table.query(KeyConditionExpression=Key("pk").eq(identifier))
-        items = response["Items"]
+        """Query prompt response from the dynamodb table using identifier
 
-        if not items:
-            return None
+        pk is the full primary key, so a GetItem reading only the response
+        attribute is enough.
+        """
+        result = self.table.get_item(
+            Key={"pk": identifier},
+            ProjectionExpression="#response",
+            ExpressionAttributeNames={"#response": "response"},
+        )
+        prompt_entry = result.get("Item")
 
-        if len(items) > 1:
-            raise Exception(f"More than one item found for {identifier}")
+        if prompt_entry is None:
+            return None
 
-        prompt_entry = items[0]
-        self._logger.info(msg=f"Prompt response: {str(prompt_entry)}")
+        self._logger.info("Prompt response: %s", prompt_entry)
         prompt_response = prompt_entry["response"]
         return prompt_response
 
     def wait_for_response(self, identifier: str):
-        """Wait for prompt response to be stored in the dynamodb table by the sqs"""
-        for retry in range(self.retry_count):
-            self._logger.info(msg=f"Retry count {retry}!")
+        """Wait for prompt response to be stored in the dynamodb table by the sqs
+
+        Polls with an exponentially growing, jittered interval, so fast
+        responses are picked up quickly while long running ones are not polled
+        more often than about once per max_poll_interval_sec.
+        """
+        deadline = time.monotonic() + self.response_timeout_sec
+        interval = self.initial_poll_interval_sec
+        retry = 0
+        while True:
+            self._logger.debug("Retry count %s!", retry)
             response = self.query_prompt_response(identifier)
-            if response is None:
-                time.sleep(self.retry_interval_sec)
-                continue
-            return response
+            if response is not None:
+                return response
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # jitter keeps concurrent waiters from polling in lockstep
+            time.sleep(min(interval * random.uniform(1, 1.3), remaining))
+            interval = min(interval * 2, self.max_poll_interval_sec)
+            retry += 1
 
         raise Exception("response timeout")
@@ -19,4 +19,4 @@ class RequestQueueHandler:
             MessageDeduplicationId=uuid,
             MessageGroupId=uuid,
         )
-        self._logger.info(msg=f"send_msg_q : {str(response)}")
+        self._logger.info("send_msg_q : %s", response)
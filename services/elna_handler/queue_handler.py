@@ -1,37 +1,47 @@
 """Queue handler for the Canister HTTP outcall"""
 
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
 
 import boto3
+import orjson
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 from elnachain import ChatOpenAI, PromptTemplate, SERPAPI
-from shared import RequestDataHandler
+from shared import BOTO3_CONFIG, RequestDataHandler
 
 
 tracer = Tracer()
 logger = Logger()
 
-dynamodb_client = boto3.resource("dynamodb")
+dynamodb_client = boto3.resource("dynamodb", config=BOTO3_CONFIG)
 
 
 request_data_handler = RequestDataHandler(
     os.environ["AI_RESPONSE_TABLE"], dynamodb_client, logger
 )
 
+# answers the records of one SQS batch concurrently, the LLM calls are I/O bound
+prompt_executor = ThreadPoolExecutor(max_workers=10, thread_name_prefix="chat-prompt")
+
 # openai_client = OpenAI(api_key=api_key)
 # ai_model = GptTurboModel(client=openai_client, logger=logger)
 
 
-def handle_chat_prompt(uuid: str, payload: str):
+def generate_chat_response(body: str):
     """generate response from OpenAI
 
+    Runs on prompt_executor, so it only makes the LLM call and leaves the
+    DynamoDB calls to the invoking thread.
+
     Args:
-        uuid (str): uuid
-        payload (str): body of the message
+        body (str): body of the message
+
+    Returns:
+        str: ai response
     """
+    payload = orjson.loads(body)
     api_key = os.environ["OPEN_AI_KEY"]
 
     llm = SERPAPI(api_key=api_key, logger=logger)
@@ -41,8 +51,43 @@ def handle_chat_prompt(uuid: str, payload: str):
     )
     chat_prompt = template.format_message()
     response = llm(chat_prompt)
-    logger.info(msg=f"ai response, {str(response)}")
-    request_data_handler.store_prompt_response(uuid, response)
+    logger.info("ai response, %s", response)
+    return response
+
+
+def handle_chat_prompts(records: list):
+    """answer the chat prompts of an SQS batch
+
+    Only the LLM calls run on prompt_executor, boto3 resources are not thread
+    safe so the DynamoDB reads and writes stay on the calling thread.
+
+    Args:
+        records (list): SQS records
+    """
+    pending = []
+    try:
+        for record in records:
+            uuid = record["attributes"]["MessageGroupId"]
+            # a redelivered message whose response is already stored needs no
+            # new LLM call
+            if request_data_handler.query_prompt_response(uuid) is not None:
+                logger.info("Response already stored for %s, skipping", uuid)
+                continue
+            pending.append(
+                (uuid, prompt_executor.submit(generate_chat_response, record["body"]))
+            )
+    finally:
+        # let every submitted record finish and store its response before the
+        # invocation ends, also when a later record could not be submitted
+        wait([future for _, future in pending])
+        for uuid, future in pending:
+            if future.exception() is None:
+                request_data_handler.store_prompt_response(uuid, future.result())
+
+    # re-raise the first failure so SQS redelivers the batch, answered records
+    # are skipped on the retry
+    for _, future in pending:
+        future.result()
 
 
 @tracer.capture_lambda_handler
@@ -54,9 +99,6 @@ def invoke(event: dict, context: LambdaContext):
         context (LambdaContext): _description_
     """
     records = event["Records"]
-    logger.info(msg=f"New event: {len(records)} records found for event ->{str(event)}")
-    # There will be only one item most of the time
-    for record in records:
-        payload = json.loads(record["body"])
-        uuid = record["attributes"]["MessageGroupId"]
-        handle_chat_prompt(uuid, payload)
+    logger.info("New event: %s records found", len(records))
+    logger.debug("event ->%s", event)
+    handle_chat_prompts(records)
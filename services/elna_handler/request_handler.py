@@ -2,11 +2,14 @@
 This is a Request handler lambda for ELNA extenral service
 """
 
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
 from http import HTTPStatus
 
 import boto3
+import orjson
 from aws_lambda_powertools import Logger, Tracer
 from aws_lambda_powertools.event_handler import (
     APIGatewayRestResolver,
@@ -24,15 +27,20 @@ from elnachain import (
     OpenAIEmbeddings,
     PromptTemplate,
 )
-from shared import AnalyticsDataHandler, RequestDataHandler, RequestQueueHandler
+from shared import (
+    BOTO3_CONFIG,
+    AnalyticsDataHandler,
+    RequestDataHandler,
+    RequestQueueHandler,
+)
 from shared.auth.backends import elna_auth_backend
 from shared.auth.middleware import elna_login_required
 
 tracer = Tracer()
 logger = Logger()
 
-sqs_client = boto3.client("sqs")
-dynamodb_client = boto3.resource("dynamodb")
+sqs_client = boto3.client("sqs", config=BOTO3_CONFIG)
+dynamodb_client = boto3.resource("dynamodb", config=BOTO3_CONFIG)
 
 queue_handler = RequestQueueHandler(
     os.environ["REQUEST_QUEUE_NAME"],
@@ -49,8 +57,67 @@ analytics_handler = AnalyticsDataHandler(
     os.environ["ANALYTICS_TABLE"], dynamodb_client, logger
 )
 
-# os_client = OpenSearchDB.connect()
-elna_client = ElnaVectorDB.connect()
+ELNA_INDEX_FIELDS = ("documents", "index_name", "file_name")
+
+# runs analytics writes alongside the LLM call instead of before it
+analytics_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="analytics")
+
+
+@lru_cache(maxsize=1)
+def get_elna_client():
+    """Connect to the Elna vector DB canister on first use
+
+    Returns:
+        Agent: ic agent reused across warm invocations
+    """
+    return ElnaVectorDB.connect()
+
+
+@lru_cache(maxsize=1)
+def get_embedding_client():
+    """Create the OpenAI embedding client on first use
+
+    Returns:
+        OpenAIEmbeddings: embedding client reused across warm invocations
+    """
+    return OpenAIEmbeddings(api_key=os.environ["OPEN_AI_KEY"], logger=logger)
+
+
+@lru_cache(maxsize=1)
+def get_chat_client():
+    """Create the OpenAI chat model on first use
+
+    Returns:
+        ChatOpenAI: chat model reused across warm invocations
+    """
+    return ChatOpenAI(api_key=os.environ["OPEN_AI_KEY"], logger=logger)
+
+
+def _json_default(obj):
+    """orjson fallback for types it can not serialize natively
+
+    Args:
+        obj: value orjson could not serialize
+
+    Returns:
+        str: string form of Decimal values
+    """
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_serializer(obj) -> str:
+    """serialize response bodies with orjson
+
+    Args:
+        obj: response body
+
+    Returns:
+        str: json string
+    """
+    return orjson.dumps(obj, default=_json_default).decode()
+
 
 app = APIGatewayRestResolver(
     cors=CORSConfig(
@@ -58,7 +125,8 @@ app = APIGatewayRestResolver(
         allow_headers=["*"],
         max_age=300,
         allow_credentials=True,
-    )
+    ),
+    serializer=json_serializer,
 )
 
 
@@ -82,7 +150,8 @@ def canister_chat_completion():
     Returns:
         response: chat response
     """
-    body = json.loads(app.current_event.body)
+    # only validated here, the raw body is forwarded to the queue as is
+    orjson.loads(app.current_event.body)
     headers = app.current_event.headers
 
     if headers.get("idempotency-key", None) is not None:
@@ -99,10 +168,10 @@ def canister_chat_completion():
 
         return resp
 
-    logger.info(msg=f"idempotency-key: {idempotency_value}")
+    logger.info("idempotency-key: %s", idempotency_value)
     custom_headers = {"idempotency-key": idempotency_value}
 
-    queue_handler.send_message(idempotency_value, json.dumps(body))
+    queue_handler.send_message(idempotency_value, app.current_event.body)
     logger.info(msg="Que handler running...")
     resp = Response(
         status_code=HTTPStatus.OK.value,
@@ -125,22 +194,37 @@ def canister_chat_completion():
 def create_embedding():
     """generate and return vecotrs
 
+    Accepts a single "text" or a list of "texts", the latter is embedded
+    with batched API calls.
+
     Returns:
-        response: embedding vector
+        response: embedding vector, or list of vectors for "texts"
     """
-    api_key = os.environ["OPEN_AI_KEY"]
-    oa_embedding = OpenAIEmbeddings(api_key=api_key, logger=logger)
+    oa_embedding = get_embedding_client()
 
-    body = json.loads(app.current_event.body)
+    body = orjson.loads(app.current_event.body)
 
-    text = body.get("text")
+    texts = body.get("texts")
+    if texts is None:
+        vectors = oa_embedding.embed_query(body.get("text"))
+    elif isinstance(texts, list) and all(isinstance(text, str) for text in texts):
+        vectors = oa_embedding.embed_documents(texts)
+    else:
+        return Response(
+            status_code=HTTPStatus.BAD_REQUEST.value,
+            content_type=content_types.APPLICATION_JSON,
+            body={
+                "statusCode": HTTPStatus.BAD_REQUEST.value,
+                "body": {"response": "texts must be a list of strings"},
+            },
+        )
 
     resp = Response(
         status_code=HTTPStatus.OK.value,
         content_type=content_types.APPLICATION_JSON,
         body={
             "statusCode": HTTPStatus.OK.value,
-            "body": {"vectors": oa_embedding.embed_query(text)},
+            "body": {"vectors": vectors},
         },
     )
 
@@ -156,15 +240,6 @@ def create_index():
         response: response
     """
 
-    api_key = os.environ["OPEN_AI_KEY"]
-    oa_embedding = OpenAIEmbeddings(api_key=api_key, logger=logger)
-
-    body = json.loads(app.current_event.body)
-    documents = body.get("documents")
-    index_name = body.get("index_name")
-    file_name = body.get("file_name")
-    # db = OpenSearchDB(client=os_client, index_name=index_name, logger=logger)
-    # resp = db.create_insert(oa_embedding, documents, file_name)
     resp = {"status": 200, "response": "Created"}
     response = Response(
         status_code=resp["status"],
@@ -186,15 +261,24 @@ def create_elna_index():
     Returns:
         _type_: _description_
     """
-    api_key = os.environ["OPEN_AI_KEY"]
-    oa_embedding = OpenAIEmbeddings(api_key=api_key, logger=logger)
+    body = orjson.loads(app.current_event.body)
+    missing = [key for key in ELNA_INDEX_FIELDS if key not in body]
+    if missing:
+        return Response(
+            status_code=HTTPStatus.BAD_REQUEST.value,
+            content_type=content_types.APPLICATION_JSON,
+            body={
+                "statusCode": HTTPStatus.BAD_REQUEST.value,
+                "body": {"response": f"missing fields: {', '.join(missing)}"},
+            },
+        )
 
-    body = json.loads(app.current_event.body)
-    documents = body.get("documents")
-    index_name = body.get("index_name")
-    file_name = body.get("file_name")
+    documents = body["documents"]
+    index_name = body["index_name"]
+    file_name = body["file_name"]
+    oa_embedding = get_embedding_client()
 
-    db = ElnaVectorDB(client=elna_client, index_name=index_name, logger=logger)
+    db = ElnaVectorDB(client=get_elna_client(), index_name=index_name, logger=logger)
     db.create_insert(oa_embedding, documents, file_name)
 
     response = Response(
@@ -218,10 +302,6 @@ def delete_index():
         resp: Response
     """
 
-    body = json.loads(app.current_event.body)
-    index_name = body.get("index_name")
-    # embedding = OpenSearchDB(client=os_client, index_name=index_name, logger=logger)
-    # resp = embedding.delete_index()
     resp = {"status": 200, "response": "Deleted"}
 
     response = Response(
@@ -245,15 +325,6 @@ def insert_embedding():
         resp: Response
     """
 
-    api_key = os.environ["OPEN_AI_KEY"]
-    oa_embedding = OpenAIEmbeddings(api_key=api_key, logger=logger)
-
-    body = json.loads(app.current_event.body)
-    documents = body.get("documents")
-    index_name = body.get("index_name")
-    # embedding = OpenSearchDB(client=os_client, index_name=index_name, logger=logger)
-    # embedding.insert(oa_embedding, documents, file_name="Title")
-
     resp = Response(
         status_code=HTTPStatus.OK.value,
         content_type=content_types.APPLICATION_JSON,
@@ -275,26 +346,6 @@ def similarity_search():
         Response: Response
     """
 
-    api_key = os.environ["OPEN_AI_KEY"]
-    oa_embedding = OpenAIEmbeddings(api_key=api_key, logger=logger)
-
-    body = json.loads(app.current_event.body)
-    query_text = body.get("query_text")
-    index_name = body.get("index_name")
-    # embedding = OpenSearchDB(client=os_client, index_name=index_name, logger=logger)
-    # is_error, results = embedding.search(oa_embedding, query_text)
-
-    # if is_error:
-    #     resp = Response(
-    #         status_code=results["status"],
-    #         content_type=content_types.APPLICATION_JSON,
-    #         body={
-    #             "statusCode": HTTPStatus.OK.value,
-    #             "body": {"response": results["response"]},
-    #         },
-    #     )
-
-    # else:
     results = "No search results"
     resp = Response(
         status_code=HTTPStatus.OK.value,
@@ -318,8 +369,6 @@ def get_filenames():
     """
     index_name = app.current_event.query_string_parameters.get("index", None)
     if index_name:
-        # db = OpenSearchDB(client=os_client, index_name=index_name, logger=logger)
-        # filenames = db.get_filenames()
         filenames = []
         resp = Response(
             status_code=HTTPStatus.OK.value,
@@ -352,13 +401,11 @@ def chat_completion():
         Response: chat responce from LLM
     """
 
-    body = json.loads(app.current_event.body)
+    body = orjson.loads(app.current_event.body)
     index_name = body.get("index_name")
-    analytics_handler.put_data(index_name)
-    api_key = os.environ["OPEN_AI_KEY"]
-    llm = ChatOpenAI(api_key=api_key, logger=logger)
-    oa_embedding = OpenAIEmbeddings(api_key=api_key, logger=logger)
-    # db = OpenSearchDB(client=os_client, index_name=index_name, logger=logger)
+    analytics_future = analytics_pool.submit(analytics_handler.put_data, index_name)
+    llm = get_chat_client()
+    oa_embedding = get_embedding_client()
     template = PromptTemplate(
         chat_client=llm,
         embedding=oa_embedding,
@@ -366,17 +413,6 @@ def chat_completion():
         logger=logger,
     )
     chat_prompt = template.get_prompt()
-    # if is_error:
-    #     resp = Response(
-    #         status_code=chat_prompt["status"],
-    #         content_type=content_types.APPLICATION_JSON,
-    #         body={
-    #             "statusCode": HTTPStatus.OK.value,
-    #             "body": {"response": chat_prompt["response"]},
-    #         },
-    #     )
-
-    # else:
     resp = Response(
         status_code=HTTPStatus.OK.value,
         content_type=content_types.APPLICATION_JSON,
@@ -385,6 +421,12 @@ def chat_completion():
             "body": {"response": llm(chat_prompt)},
         },
     )
+    # finish the write before returning, lambda freezes the process afterwards,
+    # a failed counter update must not discard the generated answer
+    try:
+        analytics_future.result()
+    except Exception:
+        logger.exception("analytics update failed for %s", index_name)
 
     return resp
 
@@ -403,12 +445,12 @@ def login():
     if request_body is None:
         raise BadRequestError("No request body provided")
 
-    request = AuthenticationRequest(**json.loads(request_body))
+    request = AuthenticationRequest(**orjson.loads(request_body))
 
     try:
         user = elna_auth_backend.authenticate(request)
     except Exception as e:
-        logger.info(msg=f"Login failed: {e}")
+        logger.info("Login failed: %s", e)
         return Response(
             status_code=HTTPStatus.BAD_REQUEST.value,
             content_type=content_types.APPLICATION_JSON,
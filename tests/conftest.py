@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+PROMPT_RESPONSE_CONDITION = (
+    "attribute_not_exists(pk) OR attribute_type(#response, :null)"
+)
+
+
+class ConditionalCheckFailedException(Exception):
+    """Raised by MockTable when a conditional put is rejected"""
+
+
+class MockTable:
+    """Stand-in for the prompt response table, items keyed by pk"""
+
+    def __init__(self):
+        self.items = {}
+        self.meta = SimpleNamespace(
+            client=SimpleNamespace(
+                exceptions=SimpleNamespace(
+                    ConditionalCheckFailedException=ConditionalCheckFailedException
+                )
+            )
+        )
+
+    def put_item(self, Item, ConditionExpression, **kwargs):
+        # evaluates the prompt response condition, a NULL response is stored
+        # as None by boto3
+        assert ConditionExpression == PROMPT_RESPONSE_CONDITION
+        assert kwargs["ExpressionAttributeValues"] == {":null": "NULL"}
+        stored = self.items.get(Item["pk"])
+        if stored is not None and stored["response"] is not None:
+            raise ConditionalCheckFailedException()
+        self.items[Item["pk"]] = Item
+
+    def get_item(self, Key, **kwargs):
+        item = self.items.get(Key["pk"])
+        if item is None:
+            return {}
+        return {"Item": {"response": item["response"]}}
+
+
+class MockDynamoDB:
+    """Stand-in for the boto3 DynamoDB resource"""
+
+    def __init__(self):
+        self.table = MockTable()
+
+    def Table(self, name):
+        return self.table
+
+
+class MockLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+    def debug(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture
+def dynamodb():
+    return MockDynamoDB()
+
+
+@pytest.fixture
+def logger():
+    return MockLogger()
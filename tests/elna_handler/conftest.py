@@ -0,0 +1,15 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# the handlers import the lambda layers and each other as top level modules
+sys.path[:0] = [
+    os.path.join(ROOT, "layers"),
+    os.path.join(ROOT, "services", "elna_handler"),
+]
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("AI_RESPONSE_TABLE", "ai-response")
+os.environ.setdefault("OPEN_AI_KEY", "test-key")
+os.environ.setdefault("IDENTITY", "")
@@ -0,0 +1,56 @@
+import pytest
+
+import queue_handler
+from shared import RequestDataHandler
+
+
+class MockLLM:
+    """Stand-in for SERPAPI recording each chat call"""
+
+    calls = []
+
+    def __init__(self, api_key, logger=None):
+        pass
+
+    def __call__(self, messages):
+        self.calls.append(messages)
+        return "ai response"
+
+
+@pytest.fixture
+def request_data_handler(dynamodb, logger, monkeypatch):
+    handler = RequestDataHandler("ai-response", dynamodb, logger)
+    monkeypatch.setattr(queue_handler, "request_data_handler", handler)
+    monkeypatch.setattr(queue_handler, "SERPAPI", MockLLM)
+    MockLLM.calls = []
+    return handler
+
+
+def make_record(uuid):
+    return {
+        "attributes": {"MessageGroupId": uuid},
+        "body": '{"biography": "bio", "greeting": "hi", "query_text": "q"}',
+    }
+
+
+def test_answer_chat_prompt(request_data_handler):
+    """Test an unanswered record is answered and stored
+
+    :return:
+    """
+
+    queue_handler.handle_chat_prompts([make_record("uuid")])
+    assert len(MockLLM.calls) == 1
+    assert request_data_handler.query_prompt_response("uuid") == "ai response"
+
+
+def test_skip_answered_chat_prompt(request_data_handler):
+    """Test a record with a stored response makes no LLM call
+
+    :return:
+    """
+
+    request_data_handler.store_prompt_response("uuid", "stored response")
+    queue_handler.handle_chat_prompts([make_record("uuid")])
+    assert MockLLM.calls == []
+    assert request_data_handler.query_prompt_response("uuid") == "stored response"
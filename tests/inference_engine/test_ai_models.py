@@ -1,8 +1,59 @@
-from src.lambdas.inference_engine.packages.ai_models import choose_service_model
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from layers.shared import ai_models
+from layers.shared.ai_models import GptTurboModel
+
+MOCK_AI_RESPONSE = "mock ai response"
+
+
+class MockClient:
+    """Stand-in for the OpenAI client returning a fixed completion"""
+
+    def __init__(self, error=None, gate=None):
+        self.chat = SimpleNamespace(completions=self)
+        self.requests = []
+        self.entered = threading.Event()
+        self._error = error
+        self._gate = gate
+
+    def create(self, model, messages):
+        self.requests.append((model, messages))
+        self.entered.set()
+        if self._gate is not None:
+            self._gate.wait()
+        if self._error is not None:
+            raise self._error
+        message = SimpleNamespace(content=f"  {MOCK_AI_RESPONSE}\n")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class MockLogger:
+    def info(self, *args, **kwargs):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    """Start every test without cached or in-flight responses"""
+    def clear():
+        ai_models._response_cache.clear()
+        ai_models._inflight_requests.clear()
+        ai_models._response_cache_stats.update(hits=0, misses=0)
+
+    clear()
+    yield
+    clear()
+
+
+def make_event(input_prompt="prompt_value"):
+    return {"biography": "bio_value", "input_prompt": input_prompt}
 
 
 def test_mock_model():
-    """Test the mock model
+    """Test the model against a mock client
 
     :return:
     """
@@ -11,8 +62,129 @@ def test_mock_model():
     mock_input_prompt = "prompt_value"
 
     mock_event = {"biography": mock_biography, "input_prompt": mock_input_prompt}
-    selected_model_cls = choose_service_model(mock_event, None)
-    ai_model = selected_model_cls(mock_event, "asd_test")
-    assert ai_model.create_response() is True
-    assert ai_model.get_text_response()[0] == mock_biography
-    assert ai_model.get_text_response()[1] == mock_input_prompt
+    client = MockClient()
+    ai_model = GptTurboModel(client, logger=MockLogger())
+    assert ai_model.create_response(mock_event) is True
+    assert ai_model.get_text_response() == MOCK_AI_RESPONSE
+    assert client.requests == [
+        (
+            GptTurboModel.model_name,
+            [
+                {"role": "system", "content": mock_biography},
+                {"role": "user", "content": mock_input_prompt},
+            ],
+        )
+    ]
+
+
+def test_missing_event_fields():
+    """Test a model event without an input prompt
+
+    :return:
+    """
+
+    ai_model = GptTurboModel(MockClient(), logger=MockLogger())
+    assert ai_model.create_response({"biography": "bio_value"}) is False
+    assert isinstance(ai_model.get_error_response(), KeyError)
+
+
+def test_cached_response():
+    """Test a repeated request is answered without a second upstream call
+
+    :return:
+    """
+
+    client = MockClient()
+    for _ in range(2):
+        ai_model = GptTurboModel(client, logger=MockLogger())
+        assert ai_model.create_response(make_event()) is True
+        assert ai_model.get_text_response() == MOCK_AI_RESPONSE
+    assert len(client.requests) == 1
+    assert ai_models.get_response_cache_stats() == {"hits": 1, "misses": 1}
+
+
+def test_cache_eviction(monkeypatch):
+    """Test the least recently used response is evicted past the cache size
+
+    :return:
+    """
+
+    monkeypatch.setattr(ai_models, "RESPONSE_CACHE_SIZE", 2)
+    client = MockClient()
+    ai_model = GptTurboModel(client, logger=MockLogger())
+    for input_prompt in ("first", "second", "third"):
+        assert ai_model.create_response(make_event(input_prompt)) is True
+    assert len(ai_models._response_cache) == 2
+
+    assert ai_model.create_response(make_event("third")) is True
+    assert len(client.requests) == 3
+    assert ai_model.create_response(make_event("first")) is True
+    assert len(client.requests) == 4
+
+
+def run_concurrently(client, event):
+    """Start a leader request blocked upstream and a follower for the same event"""
+    results = {}
+
+    def create(name):
+        ai_model = GptTurboModel(client, logger=MockLogger())
+        results[name] = (
+            ai_model.create_response(event),
+            ai_model.get_text_response(),
+            ai_model.get_error_response(),
+        )
+
+    leader = threading.Thread(target=create, args=("leader",))
+    leader.start()
+    assert client.entered.wait(timeout=5)
+    follower = threading.Thread(target=create, args=("follower",))
+    follower.start()
+    follower.join(timeout=0.1)
+    # the follower waits on the leader's call instead of calling upstream
+    assert follower.is_alive()
+    assert len(client.requests) == 1
+    return leader, follower, results
+
+
+def test_concurrent_requests_share_call():
+    """Test identical concurrent requests make a single upstream call
+
+    :return:
+    """
+
+    gate = threading.Event()
+    client = MockClient(gate=gate)
+    leader, follower, results = run_concurrently(client, make_event())
+    gate.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+
+    assert len(client.requests) == 1
+    assert results["leader"] == (True, MOCK_AI_RESPONSE, "")
+    assert results["follower"] == (True, MOCK_AI_RESPONSE, "")
+    assert ai_models.get_response_cache_stats() == {"hits": 1, "misses": 1}
+
+
+def test_failed_request_not_cached():
+    """Test an upstream error reaches waiting requests and is not cached
+
+    :return:
+    """
+
+    error = ValueError("upstream failed")
+    gate = threading.Event()
+    client = MockClient(error=error, gate=gate)
+    leader, follower, results = run_concurrently(client, make_event())
+    gate.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+
+    assert results["leader"] == (False, "", error)
+    assert results["follower"] == (False, "", error)
+    assert not ai_models._response_cache
+    assert not ai_models._inflight_requests
+
+    retry_client = MockClient()
+    ai_model = GptTurboModel(retry_client, logger=MockLogger())
+    assert ai_model.create_response(make_event()) is True
+    assert len(retry_client.requests) == 1
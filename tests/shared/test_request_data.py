@@ -0,0 +1,83 @@
+import pytest
+
+from layers.shared import request_data
+from layers.shared.request_data import RequestDataHandler
+
+
+@pytest.fixture
+def request_data_handler(dynamodb, logger):
+    return RequestDataHandler("ai-response", dynamodb, logger)
+
+
+def test_store_prompt_response(request_data_handler):
+    """Test the first response for an identifier is stored
+
+    :return:
+    """
+
+    assert request_data_handler.store_prompt_response("uuid", "response") is True
+    assert request_data_handler.query_prompt_response("uuid") == "response"
+
+
+def test_store_prompt_response_once(request_data_handler):
+    """Test a second response for an identifier is rejected
+
+    :return:
+    """
+
+    request_data_handler.store_prompt_response("uuid", "response")
+    assert request_data_handler.store_prompt_response("uuid", "retry") is False
+    assert request_data_handler.query_prompt_response("uuid") == "response"
+
+
+def test_store_prompt_response_over_null(request_data_handler):
+    """Test a null response left by a failed call can be overwritten
+
+    :return:
+    """
+
+    assert request_data_handler.store_prompt_response("uuid", None) is True
+    assert request_data_handler.query_prompt_response("uuid") is None
+    assert request_data_handler.store_prompt_response("uuid", "response") is True
+    assert request_data_handler.query_prompt_response("uuid") == "response"
+
+
+def test_wait_for_response_timeout(request_data_handler, monkeypatch):
+    """Test polling backs off up to the max interval and stops at the deadline
+
+    :return:
+    """
+
+    clock = [100.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(request_data.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(request_data.time, "sleep", sleep)
+    monkeypatch.setattr(request_data.random, "uniform", lambda low, high: low)
+    request_data_handler.response_timeout_sec = 5
+
+    with pytest.raises(Exception, match="response timeout"):
+        request_data_handler.wait_for_response("uuid")
+
+    assert sleeps[:6] == [0.05, 0.1, 0.2, 0.4, 0.8, 1]
+    assert max(sleeps) == request_data_handler.max_poll_interval_sec
+    # the last sleep is cut short so no poll happens past the deadline
+    assert sleeps[-1] < 1
+    assert clock[0] == pytest.approx(105.0)
+
+
+def test_wait_for_response(request_data_handler, monkeypatch):
+    """Test a stored response is returned as soon as it is polled
+
+    :return:
+    """
+
+    def sleep(seconds):
+        request_data_handler.store_prompt_response("uuid", "response")
+
+    monkeypatch.setattr(request_data.time, "sleep", sleep)
+    assert request_data_handler.wait_for_response("uuid") == "response"